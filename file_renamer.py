@@ -1,16 +1,133 @@
 import os
 import re
-import json
+import sys
+import queue
+import threading
+from itertools import groupby
+from operator import itemgetter
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-from pathlib import Path
+from tkinter import ttk, filedialog, messagebox
 from typing import List, Tuple, Dict
-from datetime import datetime
+
+try:
+    import orjson  # optional: much faster rollback log serialization
+except ImportError:
+    orjson = None
+
+# The process umask, read once at import (before any threads exist) so
+# rollback logs can get the usual new-file permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Predefined patterns for non-programmers
+PATTERNS = {
+    "Replace Spaces with Underscores": {
+        "pattern": r" ",
+        "description": "Convert spaces to underscores",
+        "label": "Replace spaces with underscores"
+    },
+    "Replace Spaces with Hyphens": {
+        "pattern": r" ",
+        "description": "Convert spaces to hyphens",
+        "label": "Replace spaces with hyphens"
+    },
+    "Remove Numbers": {
+        "pattern": r"\d+",
+        "description": "Delete all numbers from filenames",
+        "label": "Remove numbers"
+    },
+    "Remove Special Characters": {
+        "pattern": r"[^a-zA-Z0-9._\-\s]",
+        "description": "Keep only letters, numbers, spaces, dots, hyphens",
+        "label": "Remove special characters"
+    },
+    "Extract Numbers Only": {
+        "pattern": r"[^\d]",
+        "description": "Keep only numbers",
+        "label": "Keep numbers only"
+    },
+    "Add Prefix": {
+        "pattern": "^",
+        "description": "Add text at the start",
+        "label": "Add prefix"
+    },
+    "Add Suffix Before Extension": {
+        "pattern": r"(.*)(\.[\w]+)$",
+        "description": "Insert text before extension",
+        "label": "Add suffix"
+    },
+    "Remove Extra Spaces": {
+        "pattern": r"\s+",
+        "description": "Replace multiple spaces",
+        "label": "Remove extra spaces"
+    },
+    "Convert to Lowercase": {
+        "pattern": r"(.*)",
+        "description": "Make lowercase",
+        "label": "Convert to lowercase"
+    },
+    "Convert to Uppercase": {
+        "pattern": r"(.*)",
+        "description": "Make uppercase",
+        "label": "Convert to uppercase"
+    },
+    "Camel Case": {
+        "pattern": r"(.*)",
+        "description": "Convert to camelCase",
+        "label": "Convert to camelCase"
+    },
+    "Remove Text": {
+        "type": "remove_text",
+        "description": "Remove specific text",
+        "label": "Remove text"
+    },
+    "Replace Text": {
+        "type": "replace_text",
+        "description": "Find and replace text",
+        "label": "Replace text"
+    }
+}
+
+# Interning the option names lets names read back from the Tk variable be
+# interned too, so dict lookups and comparisons hit the identity fast path
+_PATTERN_KEYS = tuple(sys.intern(name) for name in PATTERNS)
+
+# Regex-based renaming options, compiled once at import. Plain text
+# replacements and case conversions don't use regex at all.
+_COMPILED_PATTERNS = {
+    "Remove Numbers": re.compile(r"\d+"),
+    "Remove Special Characters": re.compile(r"[^a-zA-Z0-9._\-\s]"),
+    "Extract Numbers Only": re.compile(r"[^\d]"),
+    "Add Prefix": re.compile(r"^(.*)$"),
+    "Add Suffix Before Extension": re.compile(r"^(.*?)(\.[\w]+)$"),
+    "Remove Extra Spaces": re.compile(r"\s+"),
+}
+
+# Status glyphs for per-file output lines, joined by plain concatenation
+_OK_PREFIX = "✓ "
+_ERR_PREFIX = "❌ "
+_WARN_PREFIX = "⚠️  "
 
 class RegexFileRenamerGUI:
     """A GUI-based regex file renamer with validation and safety features."""
+
+    # Fixed attribute layout: Tk callbacks touch these on every event
+    __slots__ = (
+        "root", "current_changes", "current_collisions", "patterns",
+        "_preview_token", "_debounce_after", "_dispatch",
+        "dir_var", "dir_entry", "pattern_var",
+        "replacement_row", "replacement_frame",
+        "replacement_label", "replacement_entry", "replacement_var",
+        "replace_with_label", "replace_with_entry", "replace_with_var",
+        "preview_button", "rename_button", "show_completion_modal", "output_text",
+        "_rename_in_flight", "_close_requested",
+    )
     
-    ILLEGAL_CHARS_WIN = r'[<>:"/\\|?*]'
+    # Characters Windows doesn't allow in filenames
+    _ILLEGAL_CHARS = frozenset('<>:"/\\|?*')
+
+    # Windows and macOS treat names differing only in case as the same file
+    CASE_INSENSITIVE_NAMES = os.name == "nt" or sys.platform == "darwin"
     
     # Color scheme - Professional palette
     HEADER_BG = "#1a3a52"  # Deep navy blue
@@ -24,6 +141,17 @@ class RegexFileRenamerGUI:
     SUCCESS_COLOR = "#00a86b"  # Professional green
     ERROR_COLOR = "#cc0000"  # Professional red
     WARNING_COLOR = "#ff9900"  # Professional orange
+
+    # Oldest output lines are dropped past this to keep the Text widget fast
+    MAX_OUTPUT_LINES = 10000
+
+    # Rollback logs are saved in the renamed folder; scans skip them
+    ROLLBACK_LOG_PREFIX = ".rename_log_"
+    # Held while a finished log picks its free name and is moved into place
+    _ROLLBACK_LOG_LOCK = threading.Lock()
+
+    # Batches this large finish with a bell instead of a pop-up
+    COMPLETION_MODAL_LIMIT = 500
     
     def __init__(self, root):
         self.root = root
@@ -37,81 +165,72 @@ class RegexFileRenamerGUI:
         # Configure style
         self.setup_styles()
         
-        self.rename_log = []
         self.current_changes = []
         self.current_collisions = {}
+        self._preview_token = 0
+        self._debounce_after = None
+
+        # Set from the start of a rename batch until _finalize_rename, so a
+        # second preview or batch can't run against a folder mid-rename
+        self._rename_in_flight = False
+        self._close_requested = False
+
+        # Created in setup_ui; None until then so callbacks fired while the
+        # UI is still being built can check cheaply
+        self.preview_button = None
+        self.rename_button = None
+        self.output_text = None
         
-        # Predefined patterns for non-programmers
-        self.patterns = {
-            "Replace Spaces with Underscores": {
-                "pattern": r" ",
-                "description": "Convert spaces to underscores",
-                "label": "Replace spaces with underscores"
-            },
-            "Replace Spaces with Hyphens": {
-                "pattern": r" ",
-                "description": "Convert spaces to hyphens",
-                "label": "Replace spaces with hyphens"
-            },
-            "Remove Numbers": {
-                "pattern": r"\d+",
-                "description": "Delete all numbers from filenames",
-                "label": "Remove numbers"
-            },
-            "Remove Special Characters": {
-                "pattern": r"[^a-zA-Z0-9._\-\s]",
-                "description": "Keep only letters, numbers, spaces, dots, hyphens",
-                "label": "Remove special characters"
-            },
-            "Extract Numbers Only": {
-                "pattern": r"[^\d]",
-                "description": "Keep only numbers",
-                "label": "Keep numbers only"
-            },
-            "Add Prefix": {
-                "pattern": "^",
-                "description": "Add text at the start",
-                "label": "Add prefix"
-            },
-            "Add Suffix Before Extension": {
-                "pattern": r"(.*)(\.[\w]+)$",
-                "description": "Insert text before extension",
-                "label": "Add suffix"
-            },
-            "Remove Extra Spaces": {
-                "pattern": r"\s+",
-                "description": "Replace multiple spaces",
-                "label": "Remove extra spaces"
-            },
-            "Convert to Lowercase": {
-                "pattern": r"(.*)",
-                "description": "Make lowercase",
-                "label": "Convert to lowercase"
-            },
-            "Convert to Uppercase": {
-                "pattern": r"(.*)",
-                "description": "Make uppercase",
-                "label": "Convert to uppercase"
-            },
-            "Camel Case": {
-                "pattern": r"(.*)",
-                "description": "Convert to camelCase",
-                "label": "Convert to camelCase"
-            },
-            "Remove Text": {
-                "type": "remove_text",
-                "description": "Remove specific text",
-                "label": "Remove text"
-            },
-            "Replace Text": {
-                "type": "replace_text",
-                "description": "Find and replace text",
-                "label": "Replace text"
-            }
-        }
+        # Predefined patterns for non-programmers (shared, module-level)
+        self.patterns = PATTERNS
+
+        # Renaming option -> callable(files, text, replace_with) returning the changes
+        self._dispatch = self._build_dispatch()
 
         self.setup_ui()
+
+        # Closing mid-batch would kill the rename worker and lose the log
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
+    def _build_dispatch(self):
+        """Map each renaming option to a callable producing its list of changes."""
+        def regex(option, replacement):
+            compiled = _COMPILED_PATTERNS[option]
+            return lambda files, text, replace_with: self.apply_regex(files, compiled, replacement)
+
+        def literal(needle, replacement):
+            return lambda files, text, replace_with: self.apply_literal(files, needle, replacement)
+
+        def case(transform):
+            return lambda files, text, replace_with: self.apply_case(files, transform)
+
+        def affix(option, build_template):
+            # User text is escaped so it is inserted literally and can never
+            # make the replacement template invalid
+            compiled = _COMPILED_PATTERNS[option]
+            return lambda files, text, replace_with: self.apply_regex(
+                files, compiled, build_template(text.replace("\\", r"\\"))
+            )
+
+        handlers = {
+            "Replace Spaces with Underscores": literal(" ", "_"),
+            "Replace Spaces with Hyphens": literal(" ", "-"),
+            "Remove Numbers": regex("Remove Numbers", ""),
+            "Remove Special Characters": regex("Remove Special Characters", ""),
+            "Extract Numbers Only": regex("Extract Numbers Only", ""),
+            "Add Prefix": affix("Add Prefix", lambda text: text + r"\g<1>"),
+            "Add Suffix Before Extension": affix("Add Suffix Before Extension", lambda text: r"\g<1>" + text + r"\g<2>"),
+            "Remove Extra Spaces": regex("Remove Extra Spaces", ""),
+            "Convert to Lowercase": case(str.lower),
+            "Convert to Uppercase": case(str.upper),
+            "Camel Case": case(lambda name: " ".join(map(str.capitalize, name.split()))),
+            "Remove Text": lambda files, text, replace_with: self.apply_literal(files, text, ""),
+            "Replace Text": lambda files, text, replace_with: self.apply_literal(files, text, replace_with),
+        }
+
+        # Key the table by the interned option names, in PATTERNS order
+        return {name: handlers[name] for name in _PATTERN_KEYS}
+
     def setup_styles(self):
         """Configure custom ttk styles for modern look."""
         style = ttk.Style()
@@ -168,6 +287,9 @@ class RegexFileRenamerGUI:
         # Configure radiobutton styles
         style.configure('TRadiobutton', font=('Segoe UI', 13), background=self.BG_COLOR, foreground=self.TEXT_COLOR)
         
+        # Configure checkbutton styles
+        style.configure('TCheckbutton', font=('Segoe UI', 11), background=self.BG_COLOR, foreground=self.TEXT_COLOR)
+        
         # Configure labelframe
         style.configure('TLabelframe', font=('Segoe UI', 12, 'bold'), background=self.BG_COLOR, foreground=self.PRIMARY_COLOR)
         style.configure('TLabelframe.Label', background=self.BG_COLOR, foreground=self.PRIMARY_COLOR)
@@ -240,7 +362,7 @@ class RegexFileRenamerGUI:
         dir_frame.columnconfigure(0, weight=1)
         
         self.dir_var = tk.StringVar()
-        self.dir_var.trace_add("write", self.invalidate_preview)
+        self.dir_var.trace_add("write", self._debounced_invalidate)
         self.dir_entry = ttk.Entry(dir_frame, textvariable=self.dir_var)
         self.dir_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10), ipady=8)
         
@@ -286,24 +408,17 @@ class RegexFileRenamerGUI:
         self.replacement_frame.columnconfigure(0, weight=1)
         self.replacement_frame.columnconfigure(1, weight=1)
 
-        # First label + entry
-        self.replacement_label = ttk.Label(self.replacement_frame, text="✏️  Replacement Text", style='Header.TLabel')
-        self.replacement_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        # Labels + entries are only built once an option needs them
+        # (see _ensure_replacement_widgets)
+        self.replacement_label = None
+        self.replacement_entry = None
+        self.replace_with_label = None
+        self.replace_with_entry = None
 
         self.replacement_var = tk.StringVar()
-        self.replacement_entry = ttk.Entry(self.replacement_frame, textvariable=self.replacement_var)
-        self.replacement_entry.grid(row=1, column=0, sticky=(tk.W, tk.E), ipady=8, padx=(0, 10))
-
-        # Second label + entry
-        self.replace_with_label = ttk.Label(self.replacement_frame, text="✏️  Replace With", style='Header.TLabel')
-        self.replace_with_label.grid(row=0, column=1, sticky=tk.W)
-
         self.replace_with_var = tk.StringVar()
-        self.replace_with_entry = ttk.Entry(self.replacement_frame, textvariable=self.replace_with_var)
-        self.replace_with_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), ipady=8)
-
-        self.replacement_var.trace_add("write", self.invalidate_preview)
-        self.replace_with_var.trace_add("write", self.invalidate_preview)
+        self.replacement_var.trace_add("write", self._debounced_invalidate)
+        self.replace_with_var.trace_add("write", self._debounced_invalidate)
 
         # start hidden
         self.replacement_frame.grid_remove()
@@ -319,12 +434,13 @@ class RegexFileRenamerGUI:
         button_frame.columnconfigure(1, weight=1)
         button_frame.columnconfigure(2, weight=1)
         
-        ttk.Button(
+        self.preview_button = ttk.Button(
             button_frame,
             text="🔍 Preview Changes",
             command=self.preview_changes,
             width=20
-        ).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10), ipady=10)
+        )
+        self.preview_button.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10), ipady=10)
 
         self.rename_button = ttk.Button(
             button_frame,
@@ -342,6 +458,13 @@ class RegexFileRenamerGUI:
             width=20
         ).grid(row=0, column=2, sticky=(tk.W, tk.E), ipady=10)
 
+        self.show_completion_modal = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            button_frame,
+            text="Show a pop-up when renaming finishes",
+            variable=self.show_completion_modal
+        ).grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+
         # --- OUTPUT SECTION ---
         ttk.Label(inner_frame, text="📋 Output", style='Header.TLabel').grid(row=11, column=0, sticky=tk.W, pady=(10, 10))
         
@@ -351,8 +474,16 @@ class RegexFileRenamerGUI:
         output_frame.columnconfigure(0, weight=1)
         output_frame.rowconfigure(0, weight=1)
         
-        self.output_text = scrolledtext.ScrolledText(output_frame, height=14, width=100, wrap=tk.WORD, font=('Courier New', 11))
+        # Append-only, read-only log: no undo stack needed
+        self.output_text = tk.Text(
+            output_frame, height=14, width=100, wrap=tk.WORD, font=('Courier New', 11),
+            undo=False, maxundo=0, autoseparators=False, state="disabled"
+        )
         self.output_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        output_scrollbar = ttk.Scrollbar(output_frame, orient='vertical', command=self.output_text.yview)
+        output_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.output_text.configure(yscrollcommand=output_scrollbar.set)
         
         # Configure text tags for colors
         self.output_text.tag_config("success", foreground=self.SUCCESS_COLOR, font=('Courier New', 11, 'bold'))
@@ -364,16 +495,17 @@ class RegexFileRenamerGUI:
     def on_pattern_selected(self):
         self.invalidate_preview()
 
-        selected = self.pattern_var.get()
+        selected = sys.intern(self.pattern_var.get())
 
         # Hide everything by default
         self.replacement_frame.grid_remove()
-        self.replacement_label.grid_forget()
-        self.replacement_entry.grid_forget()
-        self.replace_with_label.grid_forget()
-        self.replace_with_entry.grid_forget()
+        for widget in (self.replacement_label, self.replacement_entry,
+                       self.replace_with_label, self.replace_with_entry):
+            if widget is not None:
+                widget.grid_forget()
 
         if selected == "Remove Text":
+            self._ensure_replacement_widgets()
             self.replacement_label.config(text="✏️  Text to Remove")
             self.replacement_var.set("")
             self.replacement_frame.grid(row=self.replacement_row, column=0, sticky=(tk.W, tk.E), pady=(10, 10))
@@ -381,6 +513,7 @@ class RegexFileRenamerGUI:
             self.replacement_entry.grid(row=1, column=0, sticky=(tk.W, tk.E), ipady=8, padx=(0, 10))
 
         elif selected == "Replace Text":
+            self._ensure_replacement_widgets(replace_with=True)
             self.replacement_label.config(text="✏️  Text to Find")
             self.replacement_var.set("")
             self.replace_with_var.set("")
@@ -393,6 +526,7 @@ class RegexFileRenamerGUI:
             self.replace_with_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), ipady=8)
             
         elif selected == "Add Prefix":
+            self._ensure_replacement_widgets()
             self.replacement_label.config(text="✏️  Prefix to Add")
             self.replacement_var.set("")
             self.replacement_frame.grid(row=self.replacement_row, column=0, sticky=(tk.W, tk.E), pady=(10, 10))
@@ -400,21 +534,57 @@ class RegexFileRenamerGUI:
             self.replacement_entry.grid(row=1, column=0, sticky=(tk.W, tk.E), ipady=8, padx=(0, 10))
 
         elif selected == "Add Suffix Before Extension":
+            self._ensure_replacement_widgets()
             self.replacement_label.config(text="✏️  Suffix to Add")
             self.replacement_var.set("")
             self.replacement_frame.grid(row=self.replacement_row, column=0, sticky=(tk.W, tk.E), pady=(10, 10))
             self.replacement_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
             self.replacement_entry.grid(row=1, column=0, sticky=(tk.W, tk.E), ipady=8, padx=(0, 10))
 
+    def _ensure_replacement_widgets(self, replace_with=False):
+        """Create the replacement label/entry, and optionally the 'Replace With' pair, on first use."""
+        if self.replacement_entry is None:
+            self.replacement_label = ttk.Label(self.replacement_frame, text="✏️  Replacement Text", style='Header.TLabel')
+            self.replacement_entry = ttk.Entry(self.replacement_frame, textvariable=self.replacement_var)
+
+        if replace_with and self.replace_with_entry is None:
+            self.replace_with_label = ttk.Label(self.replacement_frame, text="✏️  Replace With", style='Header.TLabel')
+            self.replace_with_entry = ttk.Entry(self.replacement_frame, textvariable=self.replace_with_var)
+
     def log_output(self, text, tag="info"):
         """Add text to the output area."""
-        self.output_text.insert(tk.END, text + "\n", tag)
-        self.output_text.see(tk.END)
+        output = self.output_text
+        output.configure(state="normal")
+        output.insert(tk.END, text + "\n", tag)
+        self._trim_output()
+        output.configure(state="disabled")
+        output.see(tk.END)
         self.root.update()
+
+    def log_output_batch(self, lines: List[Tuple[str, str]]):
+        """Add many (text, tag) lines to the output area with one insert per tag run."""
+        output = self.output_text
+        insert = output.insert
+        output.configure(state="normal")
+        for tag, group in groupby(lines, key=itemgetter(1)):
+            insert(tk.END, "".join(text + "\n" for text, _ in group), tag)
+        self._trim_output()
+        output.configure(state="disabled")
+        output.see(tk.END)
+        self.root.update_idletasks()
+
+    def _trim_output(self):
+        """Drop the oldest lines once the output exceeds MAX_OUTPUT_LINES."""
+        line_count = int(self.output_text.index("end-1c").split(".")[0])
+        excess = line_count - self.MAX_OUTPUT_LINES
+        if excess > 0:
+            self.output_text.delete("1.0", f"{excess + 1}.0")
     
     def clear_output(self):
         """Clear the output text area."""
+        self.output_text.configure(state="normal")
         self.output_text.delete(1.0, tk.END)
+        self.output_text.configure(state="disabled")
     
     def browse_directory(self):
         """Open directory browser dialog."""
@@ -447,61 +617,127 @@ class RegexFileRenamerGUI:
     
     def is_valid_filename(self, filename: str) -> bool:
         """Check if filename contains illegal Windows characters."""
-        return not re.search(self.ILLEGAL_CHARS_WIN, filename)
+        return self._ILLEGAL_CHARS.isdisjoint(filename)
     
-    def collect_files(self, dir_path: str, recursive: bool) -> List[str]:
-        files = []
-        for filename in os.listdir(dir_path):
-            full_path = os.path.join(dir_path, filename)
-            if os.path.isfile(full_path):
-                files.append(full_path)
-        return sorted(files)
+    def collect_files(self, dir_path: str, recursive: bool) -> List[Tuple[str, str, str]]:
+        """Return (full_path, dir_path, filename) for each file, sorted by path."""
+        # scandir reuses the file type from the directory listing, so no
+        # extra stat() is needed per entry (except for symlinks)
+        with os.scandir(dir_path) as entries:
+            files = [
+                (entry.path, dir_path, entry.name)
+                for entry in entries
+                if entry.is_file() and not entry.name.startswith(self.ROLLBACK_LOG_PREFIX)
+            ]
+        files.sort()
+        return files
  
-    def apply_regex(self, files: List[str], pattern: str, replacement: str, flags: int) -> List[Tuple[str, str, str]]:
-        """Apply regex pattern and generate new filenames (regex-based patterns only)."""
+    def apply_regex(self, files: List[Tuple[str, str, str]], compiled: re.Pattern, replacement: str) -> List[Tuple[str, str, str, str]]:
+        """Apply a compiled regex and generate new filenames (regex-based patterns only)."""
         changes = []
 
-        for full_path in files:
-            old_name = os.path.basename(full_path)
+        for full_path, dir_path, old_name in files:
+            # Substitute and count matches in a single pass
+            new_name, count = compiled.subn(replacement, old_name)
 
-            # Only apply regex if pattern matches
-            if re.search(pattern, old_name, flags):
-                new_name = re.sub(pattern, replacement, old_name, flags=flags)
+            # Skip if pattern didn't match or nothing changed
+            if count == 0 or new_name == old_name:
+                continue
 
-                # Validate new filename
-                if not self.is_valid_filename(new_name):
-                    self.log_output(f"⚠️  Skipping {old_name}: new name contains illegal characters", "warning")
-                    continue
+            changes.append((full_path, dir_path, old_name, new_name))
 
-                # Skip if no change
-                if new_name == old_name:
-                    continue
+        return changes
 
-                changes.append((full_path, old_name, new_name))
+    def apply_literal(self, files: List[Tuple[str, str, str]], needle: str, replacement: str) -> List[Tuple[str, str, str, str]]:
+        """Replace plain text in filenames with str.replace (no regex needed)."""
+        changes = []
+
+        for full_path, dir_path, old_name in files:
+            # Skip if text doesn't occur or nothing changed
+            if needle not in old_name:
+                continue
+
+            new_name = old_name.replace(needle, replacement)
+            if new_name == old_name:
+                continue
+
+            changes.append((full_path, dir_path, old_name, new_name))
 
         return changes
 
-    def detect_collisions(self, changes: List[Tuple[str, str, str]]) -> Dict[str, List[str]]:
+    def apply_case(self, files: List[Tuple[str, str, str]], transform) -> List[Tuple[str, str, str, str]]:
+        """Apply a case conversion to each filename stem, keeping the extension."""
+        changes = []
+
+        for full_path, dir_path, old_name in files:
+            name, ext = os.path.splitext(old_name)
+            new_name = transform(name) + ext
+
+            if new_name != old_name:
+                changes.append((full_path, dir_path, old_name, new_name))
+
+        return changes
+
+    def _name_normalizer(self):
+        """Return the function mapping a name to the form the filesystem compares."""
+        # Casefold where the filesystem ignores case; str() hands back the
+        # same string, so this costs nothing elsewhere
+        return str.casefold if self.CASE_INSENSITIVE_NAMES else str
+
+    def detect_collisions(self, changes: List[Tuple[str, str, str, str]]) -> Dict[str, List[str]]:
         """Detect files that would map to the same new name."""
+        sep = os.sep
+        normalize = self._name_normalizer()
+        seen = set()
+        duplicates = set()
+
+        # Collisions are rare, so first look for duplicate targets with plain sets
+        for full_path, dir_path, old_name, new_name in changes:
+            key = normalize(dir_path + sep + new_name)
+            if key in seen:
+                duplicates.add(key)
+            else:
+                seen.add(key)
+
+        if not duplicates:
+            return {}
+
+        # Only then gather the old names behind each duplicate for reporting,
+        # keyed by the first target path as it was actually spelled
         collisions = {}
-        new_names = {}
-        
-        for full_path, old_name, new_name in changes:
-            dir_path = os.path.dirname(full_path)
-            key = os.path.join(dir_path, new_name)
-            
-            if key not in new_names:
-                new_names[key] = []
-            new_names[key].append(old_name)
-        
-        for key, old_names in new_names.items():
-            if len(old_names) > 1:
-                collisions[key] = old_names
-        
+        targets = {}
+        for full_path, dir_path, old_name, new_name in changes:
+            new_path = dir_path + sep + new_name
+            key = normalize(new_path)
+            if key in duplicates:
+                if key not in targets:
+                    targets[key] = new_path
+                    collisions[new_path] = []
+                collisions[targets[key]].append(old_name)
+
         return collisions
     
+    def split_invalid_names(self, changes: List[Tuple[str, str, str, str]]) -> Tuple[List[Tuple[str, str, str, str]], List[str]]:
+        """Separate changes whose new name is valid from the old names that must be skipped."""
+        valid = []
+        skipped = []
+
+        for change in changes:
+            if self.is_valid_filename(change[3]):
+                valid.append(change)
+            else:
+                skipped.append(change[2])
+
+        return valid, skipped
+
     def preview_changes(self):
         """Preview the changes without making them."""
+        # The folder is still being renamed; its listing would be stale
+        if self._rename_in_flight:
+            return
+
+        # This preview reads the latest input, so a pending invalidation is moot
+        self._cancel_debounced_invalidate()
         self.clear_output()
 
         # Validate directory
@@ -510,64 +746,48 @@ class RegexFileRenamerGUI:
             messagebox.showerror("Error", "Please select a valid directory")
             return
 
-        selected_pattern = self.pattern_var.get()
-        pattern_info = self.patterns[selected_pattern]
-
-        transform_mode = None
-        pattern = None
-        replacement = None
-
-        # -------------------------------
-        # BUILD PATTERN + REPLACEMENT
-        # -------------------------------
-        if selected_pattern == "Remove Text":
-            pattern = re.escape(self.replacement_var.get().strip())
-            replacement = ""
-
-        elif selected_pattern == "Replace Text":
-            pattern = re.escape(self.replacement_var.get().strip())
-            replacement = self.replace_with_var.get().strip()
-
-        elif selected_pattern == "Add Prefix":
-            pattern = r"^(.*)$"
-            replacement = self.replacement_var.get().strip() + r"\1"
-
-        elif selected_pattern == "Add Suffix Before Extension":
-            pattern = r"^(.*?)(\.[\w]+)$"
-            replacement = r"\1" + self.replacement_var.get().strip() + r"\2"
-
-        elif selected_pattern == "Replace Spaces with Underscores":
-            pattern = r"\s+"
-            replacement = "_"
-
-        elif selected_pattern == "Replace Spaces with Hyphens":
-            pattern = r"\s+"
-            replacement = "-"
-
-        elif selected_pattern == "Remove Numbers":
-            pattern = r"\d+"
-            replacement = ""
-
-        # -------------------------------
-        # CASE CONVERSION OPTIONS
-        # -------------------------------
-        elif selected_pattern == "Convert to Uppercase":
-            transform_mode = "upper"
+        # Scanning and matching run in the background so large folders don't
+        # freeze the window; the token lets stale results be dropped.
+        self.rename_button.config(state="disabled")
+        self._preview_token += 1
+        threading.Thread(
+            target=self._preview_worker,
+            args=(
+                self._preview_token,
+                dir_path,
+                sys.intern(self.pattern_var.get()),
+                self.replacement_var.get().strip(),
+                self.replace_with_var.get().strip()
+            ),
+            daemon=True
+        ).start()
+
+    def _preview_worker(self, token, dir_path, selected_pattern, text, replace_with):
+        """Build the preview off the Tk thread and hand it back via root.after."""
+        try:
+            files = self.collect_files(dir_path, recursive=False)
+            changes = self._dispatch[selected_pattern](files, text, replace_with)
+        except OSError as e:
+            self.root.after(0, self._show_preview_error, token, "Error", f"Could not read directory: {e}")
+            return
 
-        elif selected_pattern == "Convert to Lowercase":
-            transform_mode = "lower"
+        changes, skipped = self.split_invalid_names(changes)
+        collisions = self.detect_collisions(changes)
+        self.root.after(0, self._show_preview, token, selected_pattern, files, changes, skipped, collisions)
 
-        elif selected_pattern == "Camel Case":
-            transform_mode = "camel"
+    def _show_preview_error(self, token, title, message):
+        """Report a failed preview, unless a newer one has started since."""
+        if token == self._preview_token:
+            messagebox.showerror(title, message)
 
-        else:
-            pattern = pattern_info.get("pattern", "")
-            replacement = ""
+    def _show_preview(self, token, selected_pattern, files, changes, skipped, collisions):
+        """Display a finished preview, unless a newer one has started since."""
+        if token != self._preview_token:
+            return
 
         # -------------------------------
-        # COLLECT FILES
+        # NO FILES
         # -------------------------------
-        files = self.collect_files(dir_path, recursive=False)
         if not files:
             self.log_output("ℹ️ This folder doesn’t contain any files that can be renamed.\n", "warning")
             self.log_output("Choose a different folder and try Preview again.\n", "info")
@@ -576,53 +796,26 @@ class RegexFileRenamerGUI:
 
         self.log_output(f"✓ Found {len(files)} file(s)\n", "success")
 
-        # -------------------------------
-        # APPLY CASE CONVERSION
-        # -------------------------------
-        if transform_mode:
-            self.current_changes = []
-
-            for full_path in files:
-                old_name = os.path.basename(full_path)
-                name, ext = os.path.splitext(old_name)
-
-                if transform_mode == "upper":
-                    new_stem = name.upper()
-                elif transform_mode == "lower":
-                    new_stem = name.lower()
-                elif transform_mode == "camel":
-                    new_stem = " ".join(part.capitalize() for part in name.split())
+        if skipped:
+            self.log_output_batch([
+                (_WARN_PREFIX + "Skipping " + old_name + ": new name contains illegal characters", "warning")
+                for old_name in skipped
+            ])
 
-                new_name = new_stem + ext
-
-                if new_name != old_name:
-                    self.current_changes.append((full_path, old_name, new_name))
-
-        # -------------------------------
-        # APPLY REGEX PATTERNS
-        # -------------------------------
-        else:
-            try:
-                flags = 0
-                re.compile(pattern)
-            except re.error as e:
-                messagebox.showerror("Regex Error", f"Invalid pattern: {e}")
-                return
-
-            self.current_changes = self.apply_regex(files, pattern, replacement, flags)
-
-            # Special case: Replace Spaces options
-            if selected_pattern in ["Replace Spaces with Underscores", "Replace Spaces with Hyphens"]:
-                if not any(" " in os.path.basename(f) for f in files):
-                    self.log_output("ℹ️ None of the filenames contain any spaces.\n", "warning")
-                    self.log_output("There’s nothing to replace. Try choosing a different option or selecting another folder.\n", "info")
-                    self.rename_button.config(state="disabled")
-                    return
+        self.current_changes = changes
 
         # -------------------------------
         # NO CHANGES
         # -------------------------------
         if not self.current_changes:
+            # Special case: Replace Spaces options only produce no changes
+            # (and no skipped names) when no filename contains a space
+            if selected_pattern in ["Replace Spaces with Underscores", "Replace Spaces with Hyphens"] and not skipped:
+                self.log_output("ℹ️ None of the filenames contain any spaces.\n", "warning")
+                self.log_output("There’s nothing to replace. Try choosing a different option or selecting another folder.\n", "info")
+                self.rename_button.config(state="disabled")
+                return
+
             self.log_output("ℹ️ None of the files in this folder match your chosen option.\n", "warning")
             self.log_output("Try adjusting your renaming option or the text you entered, then preview again.\n", "info")
             self.rename_button.config(state="disabled")
@@ -631,39 +824,55 @@ class RegexFileRenamerGUI:
         # -------------------------------
         # COLLISION DETECTION
         # -------------------------------
-        self.current_collisions = self.detect_collisions(self.current_changes)
+        self.current_collisions = collisions
 
         if self.current_collisions:
-            self.log_output("\n⚠️ Some files would end up with the same name.\n", "error")
-            self.log_output("To keep your files safe, the renaming has been stopped.\n", "error")
+            # One line per colliding file, so collect them and insert once
+            # rather than redrawing the window after every line
+            lines = [
+                ("\n⚠️ Some files would end up with the same name.\n", "error"),
+                ("To keep your files safe, the renaming has been stopped.\n", "error"),
+            ]
+            add_line = lines.append
 
             for new_path, old_names in self.current_collisions.items():
-                target = os.path.basename(new_path)
-                self.log_output(f"These files would all become: {target}", "error")
-                for old_name in old_names:
-                    self.log_output(f"  - {old_name}", "error")
-                self.log_output("", "error")
+                add_line(("These files would all become: " + os.path.basename(new_path), "error"))
+                lines.extend(("  - " + old_name, "error") for old_name in old_names)
+                add_line(("", "error"))
 
-            self.log_output("Please adjust your renaming option or text and try Preview again.\n", "error")
+            add_line(("Please adjust your renaming option or text and try Preview again.\n", "error"))
+            self.log_output_batch(lines)
             self.rename_button.config(state="disabled")
             return
 
         # -------------------------------
         # DISPLAY PREVIEW
         # -------------------------------
-        self.log_output("=" * 60, "header")
-        self.log_output(f"PREVIEW: {len(self.current_changes)} file(s) will be renamed", "header")
-        self.log_output("=" * 60 + "\n", "header")
-
-        for full_path, old_name, new_name in self.current_changes:
-            self.log_output(f"  {old_name:40} → {new_name}")
+        preview_lines = [
+            ("=" * 60, "header"),
+            (f"PREVIEW: {len(self.current_changes)} file(s) will be renamed", "header"),
+            ("=" * 60 + "\n", "header"),
+        ]
+        preview_lines.extend(
+            ("  " + old_name.ljust(40) + " → " + new_name, "info")
+            for full_path, file_dir, old_name, new_name in self.current_changes
+        )
+        self.log_output_batch(preview_lines)
 
-        self.rename_button.config(state="normal")
+        if not self._rename_in_flight:
+            self.rename_button.config(state="normal")
        
        
             
     def rename_files(self):
         """Execute the rename operation."""
+        if self._rename_in_flight:
+            return
+
+        # Input edited since the preview still invalidates it right away
+        if self._cancel_debounced_invalidate():
+            self.invalidate_preview()
+
         if not self.current_changes:
             messagebox.showwarning("No Changes", "Please click 'Preview Changes' first")
             return
@@ -676,75 +885,302 @@ class RegexFileRenamerGUI:
         # Confirm before proceeding
         if messagebox.askyesno("Confirm Rename", f"Rename {len(self.current_changes)} file(s)?"):
             self.clear_output()
-            self.log_output("=" * 60, "header")
-            self.log_output("RENAMING FILES...", "header")
-            self.log_output("=" * 60 + "\n", "header")
-            
-            success_count = 0
-            fail_count = 0
-            
-            for full_path, old_name, new_name in self.current_changes:
-                dir_path = os.path.dirname(full_path)
-                new_path = os.path.join(dir_path, new_name)
-                
-                try:
-                    os.rename(full_path, new_path)
-                    self.log_output(f"✓ {old_name} → {new_name}", "success")
-                    self.rename_log.append({
-                        'old_name': old_name,
-                        'new_name': new_name,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    success_count += 1
-                except Exception as e:
-                    self.log_output(f"❌ {old_name}: {str(e)}", "error")
-                    fail_count += 1
+            self.log_output_batch([
+                ("=" * 60, "header"),
+                ("RENAMING FILES...", "header"),
+                ("=" * 60 + "\n", "header"),
+            ])
             
-           # Friendly summary
-            if fail_count == 0:
-                self.log_output("\n🎉 All files were renamed successfully.\n", "success")
+            # Renaming runs on a worker thread so slow drives don't freeze the
+            # window; results are streamed back through a queue.
+            changes = self.current_changes.copy()
+            results = queue.Queue()
+            self._rename_in_flight = True
+            self.preview_button.config(state="disabled")
+            self.rename_button.config(state="disabled")
+            self.current_changes = []
+            self.current_collisions = {}
+            self._preview_token += 1  # drop any preview still being computed
+
+            threading.Thread(target=self._rename_worker, args=(changes, results), daemon=True).start()
+            # Each batch gathers its own rollback records, so its log never
+            # picks up renames from another batch or folder
+            self.root.after(50, self._drain_rename_queue, results, changes[0][1], [], 0, 0)
+
+    def _rename_worker(self, changes: List[Tuple[str, str, str, str]], results: queue.Queue) -> None:
+        """Rename files off the Tk thread, reporting each outcome on the queue."""
+        # Only needed once a rename actually runs, so not imported at startup
+        from datetime import datetime
+
+        # Every change comes from the same scanned directory
+        dir_path = changes[0][1]
+        # Built once for the fallback path below; stripping first means a
+        # typed trailing separator doesn't end up doubled in every path
+        prefix = dir_path.rstrip(os.sep) + os.sep
+
+        # Where supported, rename relative to an open handle on that
+        # directory (renameat) so only the short names are resolved per file
+        dir_fd = None
+        if os.rename in os.supports_dir_fd:
+            try:
+                dir_fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            except OSError:
+                dir_fd = None
+
+        # The per-file step is chosen once for the whole batch rather than
+        # branching on dir_fd for every file. os.rename (not os.replace) so
+        # Windows refuses to overwrite a file that isn't part of this batch.
+        rename = os.rename
+        now = datetime.now
+
+        def rename_at(change):
+            _, _, old_name, new_name = change
+            try:
+                rename(old_name, new_name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            except Exception as e:
+                return ("error", old_name, str(e), None)
+            return ("success", old_name, new_name, now())
+
+        def rename_path(change):
+            full_path, _, old_name, new_name = change
+            try:
+                rename(full_path, prefix + new_name)
+            except Exception as e:
+                return ("error", old_name, str(e), None)
+            return ("success", old_name, new_name, now())
+
+        rename_one = rename_at if dir_fd is not None else rename_path
+
+        # os.rename releases the GIL, so renames on slow or network drives
+        # overlap; map() still reports results in preview order. If a file
+        # takes over another one's old name, order matters: stay sequential.
+        # Names are compared the way the filesystem does, so 'a.txt' taking
+        # over 'A.txt' counts too. A case-only rename of a file onto its own
+        # name doesn't: nothing else in the folder can hold that name.
+        normalize = self._name_normalizer()
+        old_names = {normalize(change[2]) for change in changes}
+        chained = False
+        for _, _, old_name, new_name in changes:
+            new_key = normalize(new_name)
+            if new_key in old_names and new_key != normalize(old_name):
+                chained = True
+                break
+
+        try:
+            if chained or len(changes) == 1:
+                # No pool to hand off to when there's nothing to overlap
+                put = results.put
+                for change in changes:
+                    put(rename_one(change))
+            else:
+                # concurrent.futures pulls in logging; only load it when a batch needs the pool
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=min(32, len(changes))) as pool:
+                    for result in pool.map(rename_one, changes):
+                        results.put(result)
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+            results.put(None)  # all renames attempted
+
+    def _drain_rename_queue(self, results: queue.Queue, dir_path: str, rename_log: List[Tuple[str, str, object]],
+                            success_count: int, fail_count: int) -> None:
+        """Log rename results that have arrived so far and reschedule until done."""
+        lines = []
+        add_line = lines.append
+        log_append = rename_log.append
+        done = False
+
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is None:
+                done = True
+                break
+
+            status, old_name, detail, timestamp = item
+            if status == "success":
+                add_line((_OK_PREFIX + old_name + " → " + detail, "success"))
+                log_append((old_name, detail, timestamp))
+                success_count += 1
             else:
-                self.log_output("\n⚠️ Some files could not be renamed.\n", "warning")
-                self.log_output(f"{success_count} file(s) updated successfully.", "info")
-                self.log_output(f"{fail_count} file(s) could not be changed.\n", "error")
-                
-            if success_count > 0:
-                self.save_rollback_log(dir_path)
-
-            # Show confirmation
+                add_line((_ERR_PREFIX + old_name + ": " + detail, "error"))
+                fail_count += 1
+
+        if done:
+            # The last results go out in the same insert as the summary
+            self._finalize_rename(success_count, fail_count, dir_path, rename_log, lines)
+            return
+
+        if lines:
+            self.log_output_batch(lines)
+        self.root.after(50, self._drain_rename_queue, results, dir_path, rename_log, success_count, fail_count)
+
+    def _finalize_rename(self, success_count: int, fail_count: int, dir_path: str,
+                         rename_log: List[Tuple[str, str, object]],
+                         pending_lines: List[Tuple[str, str]] = ()) -> None:
+        """Summarize a finished rename, save the rollback log and reset state."""
+        lines = list(pending_lines)
+
+        # Friendly summary
+        if fail_count == 0:
+            lines.append(("\n🎉 All files were renamed successfully.\n", "success"))
+        else:
+            lines.append(("\n⚠️ Some files could not be renamed.\n", "warning"))
+            lines.append((f"{success_count} file(s) updated successfully.", "info"))
+            lines.append((f"{fail_count} file(s) could not be changed.\n", "error"))
+
+        self.log_output_batch(lines)
+            
+        if success_count > 0:
+            self.save_rollback_log(dir_path, rename_log)
+
+        self._rename_in_flight = False
+        if self._close_requested:
+            # The batch is done and its log is being written: close now
+            self.root.destroy()
+            return
+        self.preview_button.config(state="normal")
+
+        # Show confirmation; large batches and users who opted out only get
+        # a summary line and a bell, so nothing blocks until dismissed
+        if self.show_completion_modal.get() and success_count + fail_count < self.COMPLETION_MODAL_LIMIT:
             if fail_count == 0:
                 messagebox.showinfo("Renaming Complete", "All files were renamed successfully.")
             else:
                 messagebox.showinfo("Renaming Finished", "Some files could not be renamed. Check the output for details.")
-            
-            # Clear output and reset state
-            self.clear_output()
-            self.current_changes = []
-            self.current_collisions = {}
-            self.rename_button.config(state="disabled")
+        else:
+            self.log_output(f"Renaming finished: {success_count} renamed, {fail_count} failed.", "info")
+            self.root.bell()
 
     
-    def save_rollback_log(self, dir_path: str) -> None:
-        """Save a JSON log for potential rollback."""
-        log_file = os.path.join(dir_path, f".rename_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    def on_close(self):
+        """Close the window, letting a running rename batch finish first."""
+        if not self._rename_in_flight:
+            self.root.destroy()
+            return
+
+        if self._close_requested:
+            # Asked twice: the drive may be hung, so offer to close anyway
+            if messagebox.askyesno(
+                "Renaming In Progress",
+                "Files are still being renamed. Close now? Some files may be left "
+                "unrenamed and no rollback log will be saved for this batch."
+            ):
+                self.root.destroy()
+            return
+
+        self._close_requested = True
+        self.log_output("Finishing the current rename before closing...", "info")
+
+    def save_rollback_log(self, dir_path: str, rename_log: List[Tuple[str, str, object]]) -> None:
+        """Save a JSON log of one batch's renames for potential rollback."""
+        # Never leave an empty [] log behind for a batch with nothing to undo
+        if not rename_log:
+            return
+
+        # Serializing and writing can stall on large logs or network drives,
+        # so it runs off the Tk thread. Not a daemon thread: closing the
+        # window must not cut a log write short.
+        threading.Thread(target=self._write_rollback_log, args=(rename_log, dir_path)).start()
+
+    def _write_rollback_log(self, batch: List[Tuple[str, str, object]], dir_path: str) -> None:
+        """Serialize and write the rollback log, reporting back via root.after."""
+        import tempfile
+        from datetime import datetime
+
+        # batch holds (old_name, new_name, timestamp) tuples; they only
+        # become dicts here. Timestamps stay datetime objects too: orjson
+        # formats them natively and the json fallback uses datetime.isoformat
+        entries = [
+            {'old_name': old_name, 'new_name': new_name, 'timestamp': timestamp}
+            for old_name, new_name, timestamp in batch
+        ]
+
+        # Microseconds keep back-to-back batches in the same folder apart
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         try:
-            with open(log_file, 'w') as f:
-                json.dump(self.rename_log, f, indent=2)
-            self.log_output(f"📝 Rollback log saved: {log_file}", "info")
+            # Serialize once, then hand the bytes to the OS in as few write() calls as possible
+            if orjson is not None:
+                data = orjson.dumps(entries, option=orjson.OPT_INDENT_2)
+            else:
+                import json
+                data = json.dumps(entries, indent=2, default=datetime.isoformat).encode("utf-8")
+
+            # Write a temp file of its own next to the log and swap it in
+            # atomically, so a half-written log never appears and concurrent
+            # writers can't clobber each other's. No fsync: the log isn't
+            # worth a sync stall on slow or network drives.
+            fd, tmp_file = tempfile.mkstemp(dir=dir_path, prefix=self.ROLLBACK_LOG_PREFIX, suffix=".tmp")
+            try:
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+                # mkstemp makes the file owner-only; give the log the mode a
+                # plain new file would have so others sharing the folder can read it
+                os.chmod(tmp_file, 0o644 & ~_UMASK)
+
+                # os.replace overwrites, so claim a name no other log holds
+                with self._ROLLBACK_LOG_LOCK:
+                    log_file = os.path.join(dir_path, f"{self.ROLLBACK_LOG_PREFIX}{stamp}.json")
+                    suffix = 1
+                    while os.path.exists(log_file):
+                        suffix += 1
+                        log_file = os.path.join(dir_path, f"{self.ROLLBACK_LOG_PREFIX}{stamp}_{suffix}.json")
+                    os.replace(tmp_file, log_file)
+            except BaseException:
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+                raise
+            self._post_log_status(f"📝 Rollback log saved: {log_file}", "info")
         except Exception as e:
-            self.log_output(f"⚠️  Could not save rollback log: {e}", "warning")
+            self._post_log_status(f"⚠️  Could not save rollback log: {e}", "warning")
+
+    def _post_log_status(self, text: str, tag: str) -> None:
+        """Report a rollback log outcome on the Tk thread, if the window is still open."""
+        # The writer outlives the window if it is closed mid-write; with no
+        # main loop left to post to, the status is simply dropped
+        try:
+            self.root.after(0, self.log_output, text, tag)
+        except (RuntimeError, tk.TclError):
+            pass
 
     def invalidate_preview(self, *args):
-        """Disable rename button and clear preview when it becomes invalid."""
-        if hasattr(self, "rename_button"):
+        """Disable rename button and discard the preview when it becomes invalid."""
+        # The output itself is left alone (the next preview or rename clears
+        # it), so rename results stay readable after further edits
+        if self.rename_button is not None:
             self.rename_button.config(state="disabled")
 
-        # Clear preview output if it exists
-        if hasattr(self, "output_text"):
-            self.clear_output()
-
         self.current_changes = []
         self.current_collisions = {}
+        self._preview_token += 1  # drop any preview still being computed
+
+    def _debounced_invalidate(self, *args):
+        """Invalidate the preview once input settles, coalescing keystroke bursts."""
+        self._cancel_debounced_invalidate()
+        self._debounce_after = self.root.after(150, self._run_debounced_invalidate)
+
+    def _run_debounced_invalidate(self):
+        self._debounce_after = None
+        self.invalidate_preview()
+
+    def _cancel_debounced_invalidate(self) -> bool:
+        """Cancel a pending debounced invalidation; return whether one was pending."""
+        if self._debounce_after is None:
+            return False
+        self.root.after_cancel(self._debounce_after)
+        self._debounce_after = None
+        return True
         
         
 def main():